@@ -60,9 +60,19 @@ def load_data():
     """, conn)
 
     # Load wait times with all related info
+    # day_of_week, hour, and is_weekend are left out here and added by
+    # add_time_metadata, which is much faster than reading them row by row.
+    # Databases the collector has not migrated yet store collected_at as text.
     wait_times_df = pd.read_sql_query("""
         SELECT
-            wt.*,
+            wt.ride_id,
+            CASE WHEN typeof(wt.collected_at) = 'text'
+                THEN CAST(strftime('%s', wt.collected_at) AS INTEGER)
+                ELSE wt.collected_at
+            END as collected_at,
+            wt.wait_time,
+            wt.is_open,
+            wt.api_last_updated,
             r.name as ride_name,
             p.name as park_name,
             l.name as land_name
@@ -75,13 +85,28 @@ def load_data():
     conn.close()
 
     if len(wait_times_df) > 0:
-        wait_times_df['collected_at'] = pd.to_datetime(wait_times_df['collected_at'])
+        wait_times_df = add_time_metadata(wait_times_df)
+        wait_times_df['collected_at'] = pd.to_datetime(wait_times_df['collected_at'], unit='s')
         wait_times_df['date'] = wait_times_df['collected_at'].dt.date
         wait_times_df['day_name'] = wait_times_df['day_of_week'].map(DAY_NAMES)
 
     return parks_df, rides_df, wait_times_df
 
 
+def add_time_metadata(df):
+    """
+    Add day_of_week, hour, and is_weekend columns from collected_at (unix seconds).
+
+    These match the database's generated columns (Monday = 0), but are computed
+    for the whole column at once instead of one row at a time.
+    """
+    days = df['collected_at'] // 86400
+    df['day_of_week'] = ((days + 3) % 7).astype('int8')  # 1970-01-01 was a Thursday
+    df['hour'] = ((df['collected_at'] // 3600) % 24).astype('int8')
+    df['is_weekend'] = (df['day_of_week'] >= 5).astype('int8')
+    return df
+
+
 # =============================================================================
 # Sidebar Filters
 # =============================================================================
@@ -19,15 +19,16 @@ from typing import Any, Optional
 
 import requests
 
-from .config import API_BASE_URL, MAX_RETRIES, PARKS, REQUEST_TIMEOUT
+from .config import API_BASE_URL, MAX_RETRIES, PARKS, REQUEST_TIMEOUT, WAIT_TIME_RETENTION_DAYS
 from .database import (
     get_ride_count,
     get_wait_time_count,
     init_database,
-    insert_land,
+    insert_lands_many,
     insert_park,
-    insert_ride,
-    insert_wait_time,
+    insert_rides_many,
+    insert_wait_times_bulk,
+    prune_old_wait_times,
 )
 
 # Set up logging
@@ -105,37 +106,43 @@ def parse_rides(api_response: dict[str, Any], park_id: int) -> list[dict[str, An
         - land_id: ID of the land (if applicable)
         - land_name: Name of the land (if applicable)
     """
+    # "id" and "name" are always present in the API response, so they're read
+    # directly; the other fields can be missing and fall back to defaults
     rides = []
 
     # Get rides from themed lands
     for land in api_response.get("lands", []):
-        land_id = land.get("id")
-        land_name = land.get("name")
+        land_id = land["id"]
+        land_name = land["name"]
 
-        for ride in land.get("rides", []):
-            rides.append({
-                "id": ride.get("id"),
-                "name": ride.get("name"),
+        rides.extend(
+            {
+                "id": ride["id"],
+                "name": ride["name"],
                 "is_open": ride.get("is_open", False),
                 "wait_time": ride.get("wait_time"),
                 "last_updated": ride.get("last_updated"),
                 "land_id": land_id,
                 "land_name": land_name,
                 "park_id": park_id,
-            })
+            }
+            for ride in land.get("rides", [])
+        )
 
     # Get standalone rides (usually single rider queues)
-    for ride in api_response.get("rides", []):
-        rides.append({
-            "id": ride.get("id"),
-            "name": ride.get("name"),
+    rides.extend(
+        {
+            "id": ride["id"],
+            "name": ride["name"],
             "is_open": ride.get("is_open", False),
             "wait_time": ride.get("wait_time"),
             "last_updated": ride.get("last_updated"),
             "land_id": None,
             "land_name": None,
             "park_id": park_id,
-        })
+        }
+        for ride in api_response.get("rides", [])
+    )
 
     return rides
 
@@ -146,8 +153,8 @@ def collect_park(park_id: int, park_name: str, collected_at: datetime) -> int:
 
     This function:
     1. Fetches data from the API
-    2. Inserts/updates park, land, and ride records
-    3. Inserts new wait time records
+    2. Inserts any new park, land, and ride records (one batch per table)
+    3. Inserts new wait time records in a single batch
 
     Args:
         park_id: The Queue-Times API ID for the park
@@ -171,30 +178,29 @@ def collect_park(park_id: int, park_name: str, collected_at: datetime) -> int:
     rides = parse_rides(data, park_id)
     logger.info(f"Found {len(rides)} rides in {park_name}")
 
-    # Insert each ride and its wait time
-    records_inserted = 0
+    # Gather land, ride, and wait time rows so each table gets one batch insert
+    land_rows = {}
+    ride_rows = []
+    wait_time_records = []
     for ride in rides:
-        # Insert land if this ride belongs to one
+        # Remember the land if this ride belongs to one
         if ride["land_id"] is not None:
-            insert_land(ride["land_id"], park_id, ride["land_name"])
-
-        # Insert ride record
-        insert_ride(
-            ride_id=ride["id"],
-            park_id=park_id,
-            name=ride["name"],
-            land_id=ride["land_id"],
-        )
+            land_rows[ride["land_id"]] = (ride["land_id"], park_id, ride["land_name"])
 
-        # Insert wait time record
-        insert_wait_time(
-            ride_id=ride["id"],
-            wait_time=ride["wait_time"],
-            is_open=ride["is_open"],
-            collected_at=collected_at,
-            api_last_updated=ride["last_updated"],
-        )
-        records_inserted += 1
+        ride_rows.append((ride["id"], ride["land_id"], park_id, ride["name"]))
+
+        wait_time_records.append((
+            ride["id"],
+            ride["wait_time"],
+            ride["is_open"],
+            collected_at,
+            ride["last_updated"],
+        ))
+
+    # Insert lands before rides, and rides before wait times, so foreign keys are satisfied
+    insert_lands_many(list(land_rows.values()))
+    insert_rides_many(ride_rows)
+    records_inserted = insert_wait_times_bulk(wait_time_records)
 
     return records_inserted
 
@@ -229,6 +235,11 @@ def collect_all_parks() -> dict[str, int]:
         else:
             logger.error(f"Failed to collect data for {park_name}")
 
+    # Delete records older than the retention period, if one is configured
+    if WAIT_TIME_RETENTION_DAYS is not None:
+        pruned = prune_old_wait_times(WAIT_TIME_RETENTION_DAYS)
+        logger.info(f"Pruned {pruned} records older than {WAIT_TIME_RETENTION_DAYS} days")
+
     # Log summary
     total_records = sum(r for r in results.values() if r >= 0)
     failed_parks = sum(1 for r in results.values() if r < 0)
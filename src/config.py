@@ -51,3 +51,8 @@ DATABASE_PATH = PROJECT_ROOT / "data" / "wait_times.db"
 # How often we collect data (in minutes)
 # This is for documentation - actual scheduling is done via GitHub Actions
 COLLECTION_INTERVAL_MINUTES = 30
+
+# How many days of wait time records to keep
+# Older records are deleted at the end of each collection run. None keeps
+# every record, which the dashboard's historical analysis relies on.
+WAIT_TIME_RETENTION_DAYS = None
@@ -9,40 +9,192 @@ This module handles all SQLite database operations including:
 The database stores historical wait time data that we collect from the API.
 """
 
+import atexit
+import calendar
+import logging
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from .config import DATABASE_PATH, WAIT_TIME_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+# The shared database connection, created the first time it's needed
+# Opening a new connection for every insert is slow, so every function in this
+# module reuses this one connection instead
+_CONN: Optional[sqlite3.Connection] = None
+_CONN_LOCK = threading.Lock()
+
+# Indexes on the wait_times table, mapping index name -> what it indexes
+# These are kept apart from the table definitions so a bulk load can build
+# them once at the end instead of updating them on every inserted row
+_WAIT_TIMES_INDEXES = {
+    # Faster time-based queries, including deleting records past the retention period
+    "idx_wait_times_collected_at": "wait_times(collected_at)",
+    # Ride-specific queries (including "ride X over time window Y") use the
+    # (ride_id, collected_at) primary key, so they don't need an index here
+    # There's deliberately no partial index on open rides (WHERE is_open = 1):
+    # nothing filters on is_open in SQL yet (the dashboard filters in pandas),
+    # so it would only slow down inserts. Add one with the first such query.
+}
+
+# How many records bulk_load prepares and inserts at a time
+BULK_LOAD_CHUNK_SIZE = 10_000
+
+# The wait_times table definition, formatted with the table name so schema
+# migrations can build a new copy of the table next to the old one
+# Every reading is identified by its ride and collection time, so that pair is
+# the primary key. WITHOUT ROWID stores rows directly in primary key order,
+# which keeps each ride's history together and skips a rowid lookup.
+# Flags are stored as 0/1 integers (SQLite has no real BOOLEAN type).
+# day_of_week, hour, and is_weekend are VIRTUAL generated columns: SQLite
+# computes them from collected_at when they are read, so they take no space.
+# collected_at and api_last_updated are in unix seconds. 1970-01-01 was a
+# Thursday (3 when Monday = 0), which gives the day of week formula.
+# dashboard/app.py add_time_metadata repeats these formulas, so keep the two
+# in sync.
+_WAIT_TIMES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        ride_id INTEGER NOT NULL,
+        collected_at INTEGER NOT NULL,
+        wait_time INTEGER,
+        is_open INTEGER NOT NULL CHECK (is_open IN (0, 1)),
+        api_last_updated INTEGER,
+        day_of_week INTEGER GENERATED ALWAYS AS ((collected_at / 86400 + 3) % 7) VIRTUAL,
+        hour INTEGER GENERATED ALWAYS AS ((collected_at / 3600) % 24) VIRTUAL,
+        is_weekend INTEGER GENERATED ALWAYS AS ((collected_at / 86400 + 3) % 7 >= 5) VIRTUAL,
+        PRIMARY KEY (ride_id, collected_at),
+        FOREIGN KEY (ride_id) REFERENCES rides(id)
+    ) WITHOUT ROWID
+"""
 
-from .config import DATABASE_PATH
+# Wait times are inserted many rows per statement: the prefix, one
+# "(?, ?, ?, ?, ?)" group per row, then the suffix (see _insert_wait_times_sql)
+# If a ride is recorded twice at the same time, the first reading is kept.
+# Only that primary key conflict is skipped (unlike OR IGNORE, which would also
+# silently drop rows breaking NOT NULL or CHECK constraints), and skipped rows
+# aren't included in the rowcount, so the wait_times counter stays exact.
+_INSERT_WAIT_TIMES_PREFIX = """
+    INSERT INTO wait_times
+    (ride_id, wait_time, is_open, collected_at, api_last_updated)
+    VALUES """
+_INSERT_WAIT_TIMES_SUFFIX = """
+    ON CONFLICT (ride_id, collected_at) DO NOTHING"""
+_WAIT_TIME_COLUMNS = 5
+
+# Rows per multi-row INSERT, keeping each statement under the 999 bound
+# parameter limit of older SQLite versions
+_WAIT_TIME_ROWS_PER_INSERT = 999 // _WAIT_TIME_COLUMNS
+
+# SQL run on every collection, kept as constants so each statement always has
+# exactly the same text. The connection caches compiled statements by their
+# text, so after the first use SQLite doesn't have to parse them again.
+_INSERT_PARK_SQL = "INSERT OR IGNORE INTO parks (id, name) VALUES (?, ?)"
+_INSERT_LAND_SQL = "INSERT OR IGNORE INTO lands (id, park_id, name) VALUES (?, ?, ?)"
+_INSERT_RIDE_SQL = "INSERT OR IGNORE INTO rides (id, land_id, park_id, name) VALUES (?, ?, ?, ?)"
+_ADD_TO_COUNTER_SQL = "UPDATE counters SET value = value + ? WHERE name = ?"
+_GET_COUNTER_SQL = "SELECT value FROM counters WHERE name = ?"
+_DELETE_WAIT_TIMES_BEFORE_SQL = "DELETE FROM wait_times WHERE collected_at < ?"
+
+# How many rows iter_query fetches from SQLite at a time
+FETCH_BATCH_SIZE = 10_000
+
+# How many compiled statements the connection keeps (sqlite3's default is 128)
+# There's room for every multi-row INSERT size as well as the statements above
+_STATEMENT_CACHE_SIZE = 512
 
 
 def get_connection() -> sqlite3.Connection:
     """
-    Create a connection to the SQLite database.
+    Get the shared connection to the SQLite database.
+
+    The connection is created on first use and reused by every later call. It
+    runs in autocommit mode, so functions that write several rows wrap them in
+    an explicit transaction.
 
-    Creates the data directory if it doesn't exist.
+    The data directory must already exist, so call init_database() once before
+    using any other function in this module (the collector always does).
 
     Returns:
         sqlite3.Connection: A connection to the database
     """
-    # Make sure the data directory exists
-    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    global _CONN
+
+    with _CONN_LOCK:
+        if _CONN is None:
+            # Connect to the database (creates it if it doesn't exist)
+            conn = sqlite3.connect(
+                DATABASE_PATH,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+
+            # Don't enforce foreign keys
+            # Checking them means an extra lookup in the parent table for every
+            # wait time we insert. The collector always inserts parks, lands,
+            # and rides before the rows that refer to them, so the checks never
+            # catch anything. The FOREIGN KEY clauses stay in the schema to
+            # document how the tables relate.
+            conn.execute("PRAGMA foreign_keys = OFF")
+
+            # Let prune_old_wait_times hand freed space back to the file system
+            # On a brand new database this only takes effect if it's set before
+            # anything (including journal_mode below) writes the file header.
+            # Existing databases are switched over by a schema migration.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+            # Tune SQLite for our write-heavy workload
+            # WAL lets the dashboard read while the collector writes, and with WAL
+            # synchronous=NORMAL is still safe but syncs to disk far less often.
+            # The WAL file is folded back into the database when the connection
+            # closes, so the committed wait_times.db is always complete.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -64000")  # ~64 MB page cache
+            conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB memory-mapped I/O
+
+            # Return rows as sqlite3.Row, so columns can be read by name
+            # (row["wait_time"]) as well as by position (row[0])
+            conn.row_factory = sqlite3.Row
+
+            _CONN = conn
+
+    return _CONN
+
+
+def close_connection() -> None:
+    """
+    Close the shared database connection, if it is open.
+
+    This runs automatically when the program exits. The next call to
+    get_connection() will open a fresh connection.
+    """
+    global _CONN
 
-    # Connect to the database (creates it if it doesn't exist)
-    conn = sqlite3.connect(DATABASE_PATH)
+    with _CONN_LOCK:
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
 
-    # Enable foreign keys for data integrity
-    conn.execute("PRAGMA foreign_keys = ON")
 
-    return conn
+atexit.register(close_connection)
 
 
 def init_database() -> None:
     """
-    Initialize the database by creating all required tables.
+    Initialize the database by creating all required tables and indexes.
 
     This function is safe to call multiple times - it uses CREATE TABLE IF NOT EXISTS.
+    Call it once before any other function in this module; it also creates the
+    data directory if it doesn't exist.
 
     Tables created:
     - parks: Theme parks we're tracking
@@ -50,9 +202,34 @@ def init_database() -> None:
     - rides: Individual attractions
     - wait_times: Historical wait time records (the main data we collect)
     """
+    init_schema_no_indexes()
+    create_indexes()
+
+    print(f"Database initialized at: {DATABASE_PATH}")
+    if WAIT_TIME_RETENTION_DAYS is None:
+        print("Wait time retention: keeping all records")
+    else:
+        print(f"Wait time retention: keeping the last {WAIT_TIME_RETENTION_DAYS} days")
+
+
+def init_schema_no_indexes() -> None:
+    """
+    Create all required tables, without the wait_times indexes.
+
+    Most code should call init_database() instead. This is used on its own
+    by bulk_load, which builds the indexes after the data is loaded.
+    """
+    # Make sure the data directory exists before the database file is opened
+    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
     conn = get_connection()
     cursor = conn.cursor()
 
+    # A brand new database gets the current schema below, so it has no
+    # migrations to run
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'wait_times'")
+    is_new_database = cursor.fetchone() is None
+
     # Create parks table
     # Stores the parks we're tracking (Islands of Adventure, Universal Studios, Epic Universe)
     cursor.execute("""
@@ -88,57 +265,216 @@ def init_database() -> None:
 
     # Create wait_times table
     # This is our main data table - stores every wait time reading we collect
+    cursor.execute(_WAIT_TIMES_TABLE_SQL.format(name="wait_times"))
+
+    # Create counters table
+    # Running totals for the rides and wait_times tables, kept up to date by the
+    # insert functions so we never have to COUNT(*) a large table
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS wait_times (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ride_id INTEGER NOT NULL,
-            wait_time INTEGER,
-            is_open BOOLEAN NOT NULL,
-            collected_at TIMESTAMP NOT NULL,
-            api_last_updated TIMESTAMP,
-            day_of_week INTEGER NOT NULL,
-            hour INTEGER NOT NULL,
-            is_weekend BOOLEAN NOT NULL,
-            FOREIGN KEY (ride_id) REFERENCES rides(id)
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
         )
     """)
+    cursor.execute(
+        "INSERT OR IGNORE INTO counters (name, value) VALUES ('rides', 0), ('wait_times', 0)"
+    )
 
-    # Create index on collected_at for faster time-based queries
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_wait_times_collected_at
-        ON wait_times(collected_at)
-    """)
+    if is_new_database:
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    else:
+        _migrate(conn)
 
-    # Create index on ride_id for faster ride-specific queries
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_wait_times_ride_id
-        ON wait_times(ride_id)
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """
+    Bring an existing database up to the current schema.
+
+    Runs every migration in _MIGRATIONS that hasn't been applied yet, each in
+    its own transaction together with the user_version bump. Afterwards the
+    database is vacuumed to give back the space freed by rebuilt tables.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+
+    pending = _MIGRATIONS[version:]
+    for next_version, migration in enumerate(pending, start=version + 1):
+        with conn:
+            cursor.execute("BEGIN")
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {next_version}")
+
+    if pending:
+        cursor.execute("VACUUM")
+
+
+# Schema migrations, applied in order to databases created by older versions
+# of this module. PRAGMA user_version records how many have been applied.
+# Each migration takes a cursor that is already inside a transaction.
+def _migrate_timestamps_to_epoch(cursor: sqlite3.Cursor) -> None:
+    """Rewrite text values of wait_times.collected_at and api_last_updated as unix seconds."""
+    for column in ("collected_at", "api_last_updated"):
+        cursor.execute(f"""
+            UPDATE wait_times
+            SET {column} = CAST(strftime('%s', {column}) AS INTEGER)
+            WHERE typeof({column}) = 'text'
+        """)
+
+
+def _rebuild_wait_times(cursor: sqlite3.Cursor) -> None:
+    """
+    Recreate wait_times with the current _WAIT_TIMES_TABLE_SQL, keeping its rows.
+
+    Columns that exist in both the old and new table are copied across, except
+    generated columns, which the new table computes itself. The old table's
+    indexes are dropped with it; create_indexes() builds the current ones.
+    """
+    cursor.execute(_WAIT_TIMES_TABLE_SQL.format(name="wait_times_new"))
+
+    # table_xinfo marks generated columns with a non-zero "hidden" value
+    cursor.execute("PRAGMA table_xinfo(wait_times_new)")
+    new_columns = {row[1] for row in cursor.fetchall() if row[6] == 0}
+    cursor.execute("PRAGMA table_xinfo(wait_times)")
+    columns = ", ".join(
+        row[1] for row in cursor.fetchall() if row[1] in new_columns and row[6] == 0
+    )
+
+    # If the old table has duplicate (ride_id, collected_at) readings, the first
+    # one is kept, as in insert_wait_times_bulk
+    cursor.execute(f"""
+        INSERT INTO wait_times_new ({columns})
+        SELECT {columns} FROM wait_times ORDER BY rowid
+        ON CONFLICT (ride_id, collected_at) DO NOTHING
     """)
+    cursor.execute("DROP TABLE wait_times")
+    cursor.execute("ALTER TABLE wait_times_new RENAME TO wait_times")
 
-    conn.commit()
-    conn.close()
 
-    print(f"Database initialized at: {DATABASE_PATH}")
+def _enable_incremental_vacuum(cursor: sqlite3.Cursor) -> None:
+    """Switch to incremental auto-vacuum (applied by the VACUUM after migrating)."""
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
 
-def insert_park(park_id: int, name: str) -> None:
+def _recount_counters(cursor: sqlite3.Cursor) -> None:
+    """Set the counters table to the actual number of rows in each counted table."""
+    for table in ("rides", "wait_times"):
+        cursor.execute(
+            f"UPDATE counters SET value = (SELECT COUNT(*) FROM {table}) WHERE name = ?",
+            (table,)
+        )
+
+
+# One entry per schema change, not per code change that touched the schema
+_MIGRATIONS = [
+    _migrate_timestamps_to_epoch,
+    # WITHOUT ROWID table keyed by (ride_id, collected_at), with INTEGER
+    # timestamps, generated time columns, and the is_open CHECK constraint
+    _rebuild_wait_times,
+    # Seed the new counters table from the existing rows
+    _recount_counters,
+    _enable_incremental_vacuum,
+]
+_SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+def create_indexes() -> None:
     """
-    Insert a park into the database if it doesn't already exist.
+    Create any missing indexes on the wait_times table.
 
-    Args:
-        park_id: The park's ID from the Queue-Times API
-        name: The park's name (e.g., "Islands of Adventure")
+    Indexes on wait_times that are no longer listed in _WAIT_TIMES_INDEXES
+    (e.g. ones replaced by a better index) are dropped. If an index had to be
+    built, ANALYZE is run afterwards so SQLite's query planner knows about it.
     """
     conn = get_connection()
     cursor = conn.cursor()
 
+    # Automatic indexes (e.g. for a primary key) have no SQL and are left alone
     cursor.execute(
-        "INSERT OR IGNORE INTO parks (id, name) VALUES (?, ?)",
-        (park_id, name)
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'wait_times' AND sql IS NOT NULL"
     )
+    existing = {row[0] for row in cursor.fetchall()}
+    missing = [name for name in _WAIT_TIMES_INDEXES if name not in existing]
+
+    for name in existing - _WAIT_TIMES_INDEXES.keys():
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for name in missing:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {_WAIT_TIMES_INDEXES[name]}")
+
+    if missing:
+        cursor.execute("ANALYZE")
+
+
+def _add_to_counter(cursor: sqlite3.Cursor, name: str, amount: int) -> None:
+    """
+    Add to one of the running totals in the counters table.
+
+    Call this inside the same transaction as the insert being counted, so the
+    total can never get out of step with the table.
+    """
+    if amount:
+        cursor.execute(_ADD_TO_COUNTER_SQL, (amount, name))
+
+
+def insert_parks_many(rows: list[tuple[int, str]]) -> None:
+    """
+    Insert many parks in one transaction, skipping any that already exist.
+
+    Args:
+        rows: Tuples of (park_id, name)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    with conn:
+        cursor.execute("BEGIN")
+        cursor.executemany(_INSERT_PARK_SQL, rows)
+
+
+def insert_lands_many(rows: list[tuple[int, int, str]]) -> None:
+    """
+    Insert many themed lands in one transaction, skipping any that already exist.
+
+    Args:
+        rows: Tuples of (land_id, park_id, name)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    with conn:
+        cursor.execute("BEGIN")
+        cursor.executemany(_INSERT_LAND_SQL, rows)
+
+
+def insert_rides_many(rows: list[tuple[int, Optional[int], int, str]]) -> None:
+    """
+    Insert many rides in one transaction, skipping any that already exist.
+
+    Args:
+        rows: Tuples of (ride_id, land_id, park_id, name), where land_id can be None
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
 
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor.execute("BEGIN")
+        cursor.executemany(_INSERT_RIDE_SQL, rows)
+        # rowcount only includes rides that were actually inserted, not ignored ones
+        _add_to_counter(cursor, "rides", cursor.rowcount)
+
+
+def insert_park(park_id: int, name: str) -> None:
+    """
+    Insert a park into the database if it doesn't already exist.
+
+    Args:
+        park_id: The park's ID from the Queue-Times API
+        name: The park's name (e.g., "Islands of Adventure")
+    """
+    insert_parks_many([(park_id, name)])
 
 
 def insert_land(land_id: int, park_id: int, name: str) -> None:
@@ -150,16 +486,7 @@ def insert_land(land_id: int, park_id: int, name: str) -> None:
         park_id: The ID of the park this land belongs to
         name: The land's name (e.g., "The Wizarding World of Harry Potter")
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "INSERT OR IGNORE INTO lands (id, park_id, name) VALUES (?, ?, ?)",
-        (land_id, park_id, name)
-    )
-
-    conn.commit()
-    conn.close()
+    insert_lands_many([(land_id, park_id, name)])
 
 
 def insert_ride(ride_id: int, park_id: int, name: str, land_id: Optional[int] = None) -> None:
@@ -172,16 +499,138 @@ def insert_ride(ride_id: int, park_id: int, name: str, land_id: Optional[int] =
         name: The ride's name (e.g., "Hagrid's Magical Creatures Motorbike Adventure")
         land_id: Optional ID of the land this ride is in (some rides are standalone)
     """
+    insert_rides_many([(ride_id, land_id, park_id, name)])
+
+
+def _to_unix_seconds(value: datetime) -> int:
+    """
+    Convert a datetime to the integer unix timestamp we store in collected_at.
+
+    Naive datetimes (like the collector's datetime.now()) are treated as UTC, so
+    the stored value always reads back as the same wall-clock time. This matches
+    how rows written before collected_at became an integer were migrated.
+
+    Args:
+        value: The datetime to convert
+
+    Returns:
+        int: Seconds since 1970-01-01 00:00:00 UTC
+    """
+    return calendar.timegm(value.utctimetuple())
+
+
+# Let datetimes passed straight to a query (e.g. WHERE collected_at >= ?) be
+# sent as unix seconds, matching how we store them, instead of as ISO text
+sqlite3.register_adapter(datetime, _to_unix_seconds)
+
+
+def _parse_api_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Convert an API timestamp like "2025-12-29T14:30:00.000Z" to unix seconds.
+
+    Args:
+        value: The last_updated value from the API (can be None)
+
+    Returns:
+        Optional[int]: Seconds since 1970-01-01 00:00:00 UTC, or None if the
+        value is missing or not a valid timestamp
+    """
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        # Store NULL rather than failing the whole batch, like the migration
+        # does for text that strftime cannot parse
+        logger.warning(f"Ignoring invalid last_updated value: {value!r}")
+        return None
+    return calendar.timegm(parsed.utctimetuple())
+
+
+def _wait_time_rows(
+    records: Iterable[tuple[int, Optional[int], bool, datetime, Optional[str]]]
+) -> list[tuple]:
+    """
+    Convert wait time records into rows for _insert_wait_time_rows.
+
+    Timestamps and the is_open flag are converted to integers here, once per
+    record, so sqlite3 doesn't have to adapt datetime or bool objects.
+
+    Args:
+        records: Tuples of (ride_id, wait_time, is_open, collected_at, api_last_updated)
+
+    Returns:
+        The same records with is_open as 0/1 and timestamps in unix seconds
+    """
+    return [
+        (
+            ride_id, wait_time, int(is_open),
+            _to_unix_seconds(collected_at), _parse_api_timestamp(api_last_updated),
+        )
+        for ride_id, wait_time, is_open, collected_at, api_last_updated in records
+    ]
+
+
+@lru_cache(maxsize=None)
+def _insert_wait_times_sql(row_count: int) -> str:
+    """Build (and cache) a multi-row INSERT into wait_times for row_count rows."""
+    placeholders = "(" + ", ".join(["?"] * _WAIT_TIME_COLUMNS) + ")"
+    return (
+        _INSERT_WAIT_TIMES_PREFIX
+        + ", ".join([placeholders] * row_count)
+        + _INSERT_WAIT_TIMES_SUFFIX
+    )
+
+
+def _insert_wait_time_rows(cursor: sqlite3.Cursor, rows: list[tuple]) -> int:
+    """
+    Insert rows from _wait_time_rows using multi-row INSERT statements.
+
+    One statement with many VALUES groups is much cheaper for SQLite than
+    running the same single-row statement once per row. Rows are sent in
+    blocks of _WAIT_TIME_ROWS_PER_INSERT, each bound as one flat tuple.
+
+    Returns:
+        int: Number of rows inserted (duplicate readings are skipped)
+    """
+    inserted = 0
+    for start in range(0, len(rows), _WAIT_TIME_ROWS_PER_INSERT):
+        block = rows[start:start + _WAIT_TIME_ROWS_PER_INSERT]
+        cursor.execute(_insert_wait_times_sql(len(block)), tuple(chain.from_iterable(block)))
+        inserted += cursor.rowcount
+    return inserted
+
+
+def insert_wait_times_bulk(
+    records: list[tuple[int, Optional[int], bool, datetime, Optional[str]]]
+) -> int:
+    """
+    Insert many wait time records in a single transaction.
+
+    Each record is a tuple of (ride_id, wait_time, is_open, collected_at, api_last_updated),
+    matching the arguments of insert_wait_time.
+
+    Committing once for the whole batch (instead of once per row) means SQLite only
+    has to sync to disk once, which is much faster when a collection run inserts
+    dozens of rides.
+
+    Args:
+        records: The wait time records to insert
+
+    Returns:
+        int: Number of records inserted (repeated readings are skipped)
+    """
+    rows = _wait_time_rows(records)
+
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        "INSERT OR IGNORE INTO rides (id, land_id, park_id, name) VALUES (?, ?, ?, ?)",
-        (ride_id, land_id, park_id, name)
-    )
+    with conn:
+        cursor.execute("BEGIN")
+        inserted = _insert_wait_time_rows(cursor, rows)
+        _add_to_counter(cursor, "wait_times", inserted)
 
-    conn.commit()
-    conn.close()
+    return inserted
 
 
 def insert_wait_time(
@@ -194,8 +643,9 @@ def insert_wait_time(
     """
     Insert a wait time record into the database.
 
-    This is the main function we call during data collection. It automatically
-    enriches the record with metadata like day of week, hour, and weekend flag.
+    The database fills in metadata like day of week, hour, and weekend flag from
+    collected_at. During data collection we use insert_wait_times_bulk instead,
+    which stores a whole batch of records in one transaction.
 
     Args:
         ride_id: The ride's ID from the Queue-Times API
@@ -204,42 +654,99 @@ def insert_wait_time(
         collected_at: When we collected this data point
         api_last_updated: The last_updated timestamp from the API (optional)
     """
+    insert_wait_times_bulk([(ride_id, wait_time, is_open, collected_at, api_last_updated)])
+
+
+def bulk_load(
+    records: Iterable[tuple[int, Optional[int], bool, datetime, Optional[str]]]
+) -> int:
+    """
+    Load a large batch of historical wait time records (e.g. a backfill or CSV import).
+
+    Keeping indexes up to date on every insert is the slowest part of a big load,
+    so this drops the wait_times indexes, streams the records in chunks of
+    BULK_LOAD_CHUNK_SIZE inside one transaction, and then rebuilds the indexes
+    once at the end.
+
+    Args:
+        records: Tuples of (ride_id, wait_time, is_open, collected_at, api_last_updated)
+
+    Returns:
+        int: Number of records loaded (duplicates of existing readings are skipped)
+    """
+    init_schema_no_indexes()
+
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Enrich with time-based metadata
-    # These fields make analysis easier later
-    day_of_week = collected_at.weekday()  # 0 = Monday, 6 = Sunday
-    hour = collected_at.hour  # 0-23
-    is_weekend = day_of_week >= 5  # Saturday (5) or Sunday (6)
+    records = iter(records)
+    loaded = 0
 
-    cursor.execute(
-        """
-        INSERT INTO wait_times
-        (ride_id, wait_time, is_open, collected_at, api_last_updated, day_of_week, hour, is_weekend)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (ride_id, wait_time, is_open, collected_at, api_last_updated, day_of_week, hour, is_weekend)
-    )
+    with conn:
+        cursor.execute("BEGIN")
+
+        for name in _WAIT_TIMES_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+        while chunk := list(islice(records, BULK_LOAD_CHUNK_SIZE)):
+            loaded += _insert_wait_time_rows(cursor, _wait_time_rows(chunk))
 
-    conn.commit()
-    conn.close()
+        _add_to_counter(cursor, "wait_times", loaded)
+
+    create_indexes()
+
+    return loaded
+
+
+def prune_old_wait_times(days: int = 90) -> int:
+    """
+    Delete wait time records collected more than the given number of days ago.
+
+    This keeps the wait_times table (and the database file) from growing
+    forever. The space the deleted rows used is given back to the file system
+    straight away, since the database uses incremental auto-vacuum.
+
+    Args:
+        days: How many days of records to keep
+
+    Returns:
+        int: Number of records deleted
+    """
+    cutoff = _to_unix_seconds(datetime.now() - timedelta(days=days))
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    with conn:
+        cursor.execute("BEGIN")
+        cursor.execute(_DELETE_WAIT_TIMES_BEFORE_SQL, (cutoff,))
+        deleted = cursor.rowcount
+        _add_to_counter(cursor, "wait_times", -deleted)
+
+    if deleted:
+        # executescript runs the pragma to completion; execute() would only
+        # free a single page
+        conn.executescript("PRAGMA incremental_vacuum;")
+
+    return deleted
 
 
 def get_ride_count() -> int:
     """
     Get the total number of rides in the database.
 
+    This reads the running total from the counters table, so it's instant no
+    matter how big the database gets.
+
     Returns:
         int: Number of rides
     """
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) FROM rides")
+    cursor.execute(_GET_COUNTER_SQL, ("rides",))
     count = cursor.fetchone()[0]
 
-    conn.close()
     return count
 
 
@@ -247,19 +754,45 @@ def get_wait_time_count() -> int:
     """
     Get the total number of wait time records in the database.
 
+    This reads the running total from the counters table, so it's instant no
+    matter how big the database gets.
+
     Returns:
         int: Number of wait time records
     """
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) FROM wait_times")
+    cursor.execute(_GET_COUNTER_SQL, ("wait_times",))
     count = cursor.fetchone()[0]
 
-    conn.close()
     return count
 
 
+def iter_query(
+    sql: str, params: tuple = (), batch_size: int = FETCH_BATCH_SIZE
+) -> Iterator[sqlite3.Row]:
+    """
+    Run a query and yield its rows, fetching them from SQLite in batches.
+
+    Use this for queries that can return a lot of rows (e.g. a ride's full
+    wait time history) so they never all have to be held in memory at once.
+
+    Args:
+        sql: The SELECT statement to run
+        params: Values for the statement's ? placeholders
+        batch_size: How many rows to fetch at a time
+
+    Yields:
+        sqlite3.Row: Each result row, readable by column name or position
+    """
+    conn = get_connection()
+    cursor = conn.execute(sql, params)
+
+    while rows := cursor.fetchmany(batch_size):
+        yield from rows
+
+
 if __name__ == "__main__":
     # If run directly, initialize the database
     init_database()
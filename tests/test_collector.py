@@ -1,13 +1,17 @@
 """
 Tests for the collector module.
 
-These tests verify that our API response parsing works correctly
-without actually making API calls.
+These tests verify that our API response parsing and collection work
+correctly without actually making API calls.
 """
 
+import sqlite3
+from datetime import datetime
+from unittest.mock import Mock, patch
+
 import pytest
 
-from src.collector import parse_rides
+from src.collector import collect_park, parse_rides
 
 
 # Sample API response that matches the Queue-Times format
@@ -129,3 +133,70 @@ class TestParseRides:
         assert len(rides) == 1
         assert rides[0]["name"] == "Test Ride"
         assert rides[0]["land_id"] is None
+
+
+class TestCollectPark:
+    """Tests for the collect_park function."""
+
+    @pytest.fixture(autouse=True)
+    def setup_test_db(self, tmp_path):
+        """Set up a temporary database and a canned API response for each test."""
+        test_db_path = tmp_path / "test_wait_times.db"
+
+        with patch("src.database.DATABASE_PATH", test_db_path), \
+                patch("src.collector.fetch_park_data", return_value=SAMPLE_API_RESPONSE):
+            from src.database import close_connection, init_database
+
+            init_database()
+            self.db_path = test_db_path
+
+            yield
+
+            close_connection()
+
+    def count_rows(self, table):
+        """Count the rows in a table of the test database."""
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.close()
+        return count
+
+    def test_stores_lands_rides_and_wait_times(self):
+        """Each table should get one batch, with lands listed once per land."""
+        from src.database import insert_lands_many, insert_rides_many, insert_wait_times_bulk
+
+        calls = Mock()
+        with patch("src.collector.insert_lands_many", wraps=insert_lands_many) as lands, \
+                patch("src.collector.insert_rides_many", wraps=insert_rides_many) as rides, \
+                patch("src.collector.insert_wait_times_bulk", wraps=insert_wait_times_bulk) as wait_times:
+            calls.attach_mock(lands, "insert_lands_many")
+            calls.attach_mock(rides, "insert_rides_many")
+            calls.attach_mock(wait_times, "insert_wait_times_bulk")
+
+            inserted = collect_park(64, "Islands of Adventure", datetime(2025, 12, 30, 14, 30, 0))
+
+        # Lands before rides before wait times, so every reference already exists
+        assert [name for name, args, kwargs in calls.mock_calls] == [
+            "insert_lands_many",
+            "insert_rides_many",
+            "insert_wait_times_bulk",
+        ]
+        # Two rides share the Wizarding World land, but it is inserted once
+        assert lands.call_args.args[0] == [
+            (100, 64, "The Wizarding World of Harry Potter"),
+            (101, 64, "Jurassic Park"),
+        ]
+
+        assert inserted == 4
+        assert self.count_rows("parks") == 1
+        assert self.count_rows("lands") == 2
+        assert self.count_rows("rides") == 4
+        assert self.count_rows("wait_times") == 4
+
+    def test_repeated_collection_inserts_nothing(self):
+        """A second run with the same collected_at should report 0 new records."""
+        collected_at = datetime(2025, 12, 30, 14, 30, 0)
+
+        assert collect_park(64, "Islands of Adventure", collected_at) == 4
+        assert collect_park(64, "Islands of Adventure", collected_at) == 0
+        assert self.count_rows("wait_times") == 4
@@ -7,7 +7,7 @@ using a temporary test database.
 
 import sqlite3
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
 
@@ -23,33 +23,47 @@ class TestDatabaseOperations:
         Set up a temporary database for each test.
 
         This patches the DATABASE_PATH to use a temporary directory,
-        so we don't affect the real database.
+        so we don't affect the real database. The shared connection is
+        closed afterwards so the next test connects to its own database.
         """
         test_db_path = tmp_path / "test_wait_times.db"
 
         with patch("src.database.DATABASE_PATH", test_db_path):
             # Import the functions after patching
             from src.database import (
+                bulk_load,
+                close_connection,
                 get_ride_count,
                 get_wait_time_count,
                 init_database,
                 insert_land,
+                insert_lands_many,
                 insert_park,
                 insert_ride,
+                insert_rides_many,
                 insert_wait_time,
+                insert_wait_times_bulk,
+                prune_old_wait_times,
             )
 
             self.init_database = init_database
+            self.bulk_load = bulk_load
             self.insert_park = insert_park
             self.insert_land = insert_land
             self.insert_ride = insert_ride
+            self.insert_lands_many = insert_lands_many
+            self.insert_rides_many = insert_rides_many
             self.insert_wait_time = insert_wait_time
+            self.insert_wait_times_bulk = insert_wait_times_bulk
+            self.prune_old_wait_times = prune_old_wait_times
             self.get_ride_count = get_ride_count
             self.get_wait_time_count = get_wait_time_count
             self.db_path = test_db_path
 
             yield
 
+            close_connection()
+
     def test_init_database_creates_tables(self):
         """init_database should create all required tables."""
         self.init_database()
@@ -70,6 +84,29 @@ class TestDatabaseOperations:
         assert "rides" in tables
         assert "wait_times" in tables
 
+    def test_init_database_creates_data_directory(self, tmp_path):
+        """init_database should create the data directory if it's missing."""
+        from src.database import close_connection
+
+        close_connection()
+        db_path = tmp_path / "missing" / "test_wait_times.db"
+
+        with patch("src.database.DATABASE_PATH", db_path):
+            self.init_database()
+            close_connection()
+
+        assert db_path.exists()
+
+    def test_init_database_enables_incremental_vacuum(self):
+        """New databases should use incremental auto-vacuum so pruning frees space."""
+        self.init_database()
+
+        conn = sqlite3.connect(self.db_path)
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        conn.close()
+
+        assert auto_vacuum == 2  # INCREMENTAL
+
     def test_insert_park(self):
         """insert_park should add a park to the database."""
         self.init_database()
@@ -107,6 +144,21 @@ class TestDatabaseOperations:
 
         assert self.get_ride_count() == 1
 
+    def test_insert_rides_many(self):
+        """insert_rides_many should add every new ride and skip existing ones."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_lands_many([(100, 64, "The Wizarding World of Harry Potter")])
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures", land_id=100)
+
+        self.insert_rides_many([
+            (1001, 100, 64, "Hagrid's Magical Creatures"),
+            (1002, 100, 64, "Harry Potter and the Forbidden Journey"),
+            (2001, None, 64, "Hagrid's - Single Rider"),
+        ])
+
+        assert self.get_ride_count() == 3
+
     def test_insert_wait_time_with_metadata(self):
         """insert_wait_time should enrich records with time metadata."""
         self.init_database()
@@ -127,7 +179,7 @@ class TestDatabaseOperations:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT wait_time, is_open, day_of_week, hour, is_weekend
+            SELECT wait_time, is_open, day_of_week, hour, is_weekend, collected_at, api_last_updated
             FROM wait_times WHERE ride_id = 1001
             """
         )
@@ -140,6 +192,8 @@ class TestDatabaseOperations:
         assert result[2] == 0  # day_of_week (Monday = 0)
         assert result[3] == 14  # hour
         assert result[4] == 0  # is_weekend (False = 0 in SQLite)
+        assert result[5] == 1767018600  # collected_at (2025-12-29 14:30:00 as unix seconds)
+        assert result[6] == 1767018600  # api_last_updated (also unix seconds)
 
     def test_insert_wait_time_on_weekend(self):
         """Weekend flag should be True for Saturday/Sunday."""
@@ -164,6 +218,89 @@ class TestDatabaseOperations:
 
         assert result[0] == 1  # is_weekend (True = 1 in SQLite)
 
+    def test_insert_wait_time_ignores_duplicate_reading(self):
+        """A second reading for the same ride and time should be skipped."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+
+        test_time = datetime(2025, 12, 29, 14, 30, 0)
+        self.insert_wait_time(1001, 60, True, test_time)
+        self.insert_wait_time(1001, 75, True, test_time)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT wait_time FROM wait_times WHERE ride_id = 1001")
+        results = cursor.fetchall()
+        conn.close()
+
+        assert results == [(60,)]
+        assert self.get_wait_time_count() == 1
+
+    def test_datetime_query_parameters_match_stored_times(self):
+        """Datetimes passed as query parameters should compare against stored unix seconds."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+        self.insert_wait_time(1001, 60, True, datetime(2025, 12, 29, 10, 0, 0))
+        self.insert_wait_time(1001, 75, True, datetime(2025, 12, 29, 11, 0, 0))
+
+        from src.database import get_connection
+
+        cursor = get_connection().cursor()
+        cursor.execute(
+            "SELECT wait_time FROM wait_times WHERE collected_at >= ?",
+            (datetime(2025, 12, 29, 10, 30, 0),),
+        )
+
+        assert [row["wait_time"] for row in cursor.fetchall()] == [75]
+
+    def test_wait_times_rejects_non_boolean_is_open(self):
+        """is_open should only accept 0 or 1."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+
+        test_time = datetime(2025, 12, 29, 14, 30, 0)
+        with pytest.raises(sqlite3.IntegrityError):
+            self.insert_wait_time(1001, 60, 2, test_time)
+        with pytest.raises(sqlite3.IntegrityError):
+            self.insert_wait_times_bulk([(1001, 60, 2, test_time, None)])
+
+        assert self.get_wait_time_count() == 0
+
+    def test_prune_old_wait_times(self):
+        """prune_old_wait_times should delete only records older than the cutoff."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+
+        now = datetime.now()
+        self.insert_wait_time(1001, 60, True, now - timedelta(days=100))
+        self.insert_wait_time(1001, 75, True, now - timedelta(days=91))
+        self.insert_wait_time(1001, 90, True, now - timedelta(days=1))
+
+        deleted = self.prune_old_wait_times(days=90)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT wait_time FROM wait_times")
+        results = cursor.fetchall()
+        conn.close()
+
+        assert deleted == 2
+        assert results == [(90,)]
+        assert self.get_wait_time_count() == 1
+
+    def test_insert_wait_time_rejects_missing_ride_id(self):
+        """Rows breaking NOT NULL constraints should raise, not be silently skipped."""
+        self.init_database()
+
+        with pytest.raises(sqlite3.IntegrityError):
+            self.insert_wait_time(None, None, True, datetime(2025, 12, 29, 14, 30, 0))
+
+        assert self.get_wait_time_count() == 0
+
     def test_get_wait_time_count(self):
         """get_wait_time_count should return correct count."""
         self.init_database()
@@ -174,9 +311,229 @@ class TestDatabaseOperations:
         assert self.get_wait_time_count() == 0
 
         # Insert some records
-        now = datetime.now()
-        self.insert_wait_time(1001, 60, True, now)
-        self.insert_wait_time(1001, 75, True, now)
-        self.insert_wait_time(1001, 90, True, now)
+        self.insert_wait_time(1001, 60, True, datetime(2025, 12, 29, 10, 0, 0))
+        self.insert_wait_time(1001, 75, True, datetime(2025, 12, 29, 10, 30, 0))
+        self.insert_wait_time(1001, 90, True, datetime(2025, 12, 29, 11, 0, 0))
 
         assert self.get_wait_time_count() == 3
+
+    def test_insert_wait_times_bulk(self):
+        """insert_wait_times_bulk should store every record with metadata."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+        self.insert_ride(1002, 64, "VelociCoaster")
+
+        saturday = datetime(2025, 12, 27, 12, 0, 0)  # Saturday
+        self.insert_wait_times_bulk([
+            (1001, 120, True, saturday, "2025-12-27T12:00:00.000Z"),
+            (1002, None, False, saturday, None),
+        ])
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT ride_id, wait_time, is_open, day_of_week, hour, is_weekend
+            FROM wait_times ORDER BY ride_id
+            """
+        )
+        results = cursor.fetchall()
+        conn.close()
+
+        assert results == [
+            (1001, 120, 1, 5, 12, 1),
+            (1002, None, 0, 5, 12, 1),
+        ]
+
+    def test_insert_wait_times_bulk_stores_invalid_last_updated_as_null(self):
+        """A malformed last_updated should not stop the rest of the batch."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+        self.insert_ride(1002, 64, "VelociCoaster")
+        self.insert_ride(1003, 64, "Jurassic Park River Adventure")
+
+        collected_at = datetime(2025, 12, 29, 14, 30, 0)
+        inserted = self.insert_wait_times_bulk([
+            (1001, 60, True, collected_at, "2025-12-29T14:25:00.000Z"),
+            (1002, 45, True, collected_at, "garbage"),
+            (1003, 20, True, collected_at, ""),
+        ])
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT ride_id, api_last_updated FROM wait_times ORDER BY ride_id")
+        results = cursor.fetchall()
+        conn.close()
+
+        assert inserted == 3
+        assert results == [(1001, 1767018300), (1002, None), (1003, None)]
+
+    def test_insert_wait_times_bulk_spans_several_statements(self):
+        """Batches bigger than one multi-row INSERT should be stored completely."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+
+        records = [
+            (1001, 30, True, datetime(2025, 12, 29, 0, 0, 0) + timedelta(minutes=minute), None)
+            for minute in range(450)
+        ]
+        # A repeated reading should be skipped, not counted
+        records.append(records[0])
+        inserted = self.insert_wait_times_bulk(records)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM wait_times")
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        assert inserted == 450
+        assert count == 450
+        assert self.get_wait_time_count() == 450
+
+    def test_get_connection_is_shared(self):
+        """get_connection should reuse one connection until it is closed."""
+        from src.database import close_connection, get_connection
+
+        conn = get_connection()
+        assert get_connection() is conn
+
+        close_connection()
+        assert get_connection() is not conn
+
+    def test_get_connection_uses_wal(self):
+        """The shared connection should use write-ahead logging."""
+        from src.database import get_connection
+
+        conn = get_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert journal_mode == "wal"
+
+    def test_bulk_load_rebuilds_indexes(self):
+        """bulk_load should insert every record and leave the indexes in place."""
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+
+        records = (
+            (1001, minute, True, datetime(2025, 12, 29, 10, minute, 0), None)
+            for minute in range(60)
+        )
+        loaded = self.bulk_load(records)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'wait_times'"
+        )
+        indexes = {row[0] for row in cursor.fetchall()}
+        conn.close()
+
+        assert loaded == 60
+        assert self.get_wait_time_count() == 60
+        assert "idx_wait_times_collected_at" in indexes
+
+    def test_ride_time_range_query_uses_primary_key(self):
+        """Per-ride time range queries should be served by the (ride_id, collected_at) key."""
+        self.init_database()
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT wait_time FROM wait_times
+            WHERE ride_id = ? AND collected_at BETWEEN ? AND ?
+            ORDER BY collected_at
+            """,
+            (1001, 1766966400, 1767052800),
+        )
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        conn.close()
+
+        assert "PRIMARY KEY (ride_id=? AND collected_at>? AND collected_at<?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_init_database_migrates_old_wait_times_table(self):
+        """Databases from older versions should be migrated to the current wait_times table."""
+        # Build a wait_times table the way older versions of this module did
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE rides (
+                id INTEGER PRIMARY KEY,
+                land_id INTEGER,
+                park_id INTEGER NOT NULL,
+                name TEXT NOT NULL
+            )
+        """)
+        conn.execute("INSERT INTO rides (id, park_id, name) VALUES (1001, 64, 'Test Ride')")
+        conn.execute("""
+            CREATE TABLE wait_times (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ride_id INTEGER NOT NULL,
+                wait_time INTEGER,
+                is_open BOOLEAN NOT NULL,
+                collected_at TIMESTAMP NOT NULL,
+                api_last_updated TIMESTAMP,
+                day_of_week INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                is_weekend BOOLEAN NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO wait_times "
+            "(ride_id, wait_time, is_open, collected_at, api_last_updated, "
+            "day_of_week, hour, is_weekend) "
+            "VALUES (1001, 60, 1, '2025-12-29 14:30:00.123456', "
+            "'2025-12-29T14:25:00.000Z', 0, 14, 0)"
+        )
+        # A later duplicate reading for the same ride and time should be dropped
+        conn.execute(
+            "INSERT INTO wait_times "
+            "(ride_id, wait_time, is_open, collected_at, api_last_updated, "
+            "day_of_week, hour, is_weekend) "
+            "VALUES (1001, 75, 1, '2025-12-29 14:30:00.123456', "
+            "'2025-12-29T14:28:00.000Z', 0, 14, 0)"
+        )
+        conn.commit()
+        conn.close()
+
+        self.init_database()
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT ride_id, collected_at, wait_time, api_last_updated FROM wait_times")
+        result = cursor.fetchone()
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'wait_times'")
+        table_sql = cursor.fetchone()[0]
+        conn.close()
+
+        assert result == (1001, 1767018600, 60, 1767018300)
+        assert "WITHOUT ROWID" in table_sql
+        assert self.get_wait_time_count() == 1
+        assert self.get_ride_count() == 1
+
+    def test_iter_query_streams_named_rows(self):
+        """iter_query should yield every row, readable by column name."""
+        from src.database import iter_query
+
+        self.init_database()
+        self.insert_park(64, "Islands of Adventure")
+        self.insert_ride(1001, 64, "Hagrid's Magical Creatures")
+        self.insert_wait_times_bulk([
+            (1001, minute, True, datetime(2025, 12, 29, 10, minute, 0), None)
+            for minute in range(25)
+        ])
+
+        rows = list(iter_query(
+            "SELECT wait_time, hour FROM wait_times WHERE ride_id = ? ORDER BY collected_at",
+            (1001,),
+            batch_size=10,
+        ))
+
+        assert [row["wait_time"] for row in rows] == list(range(25))
+        assert all(row["hour"] == 10 for row in rows)